@@ -65,11 +65,11 @@ class DeviceManager:
                 try:
                     device = self.create_device(address, config.get("type"), config, None)
                     self.devices[address.upper()] = device
-                    _LOGGER.info(f"Successfully loaded device from config: {address}")
+                    _LOGGER.info("Successfully loaded device from config: %s", address)
                 except (ValueError, TypeError) as e:
-                    _LOGGER.error(f"Failed to create device for address {address} from config: {e}")
+                    _LOGGER.error("Failed to create device for address %s from config: %s", address, e)
         except (json.JSONDecodeError, IOError) as e:
-            _LOGGER.exception(f"Failed to read or parse config file at {CONFIG_FILE_PATH}")
+            _LOGGER.exception("Failed to read or parse config file at %s", CONFIG_FILE_PATH)
 
     def save_devices_to_config(self):
         """Saves the current device configurations to the JSON config file."""
@@ -81,9 +81,9 @@ class DeviceManager:
             os.makedirs(os.path.dirname(CONFIG_FILE_PATH), exist_ok=True)
             with open(CONFIG_FILE_PATH, 'w') as f:
                 json.dump(configs, f, indent=2)
-            _LOGGER.info(f"Successfully saved {len(configs)} device(s) to {CONFIG_FILE_PATH}")
+            _LOGGER.info("Successfully saved %s device(s) to %s", len(configs), CONFIG_FILE_PATH)
         except IOError:
-            _LOGGER.exception(f"Failed to write to config file at {CONFIG_FILE_PATH}")
+            _LOGGER.exception("Failed to write to config file at %s", CONFIG_FILE_PATH)
 
     async def start_polling_device(self, device: BaseDevice, publish_discovery: bool = False):
         """Creates a dedicated, cancellable polling loop for a device."""
@@ -92,24 +92,22 @@ class DeviceManager:
         if publish_discovery and self._mqtt_publisher:
             self._mqtt_publisher.publish_mqtt_discovery(device)
 
-        _LOGGER.info(f"Starting polling task for {address}")
-
         async def polling_loop():
             availability_topic = f"blupow/{address}/status"
+            state_topic = f"blupow/{device.mac_address}/state"
             while True:
-                _LOGGER.info(f"Polling device: {address}")
+                _LOGGER.debug("Polling device: %s", address)
                 try:
                     data = await device.poll()
                     if data and self._mqtt_publisher:
                         self._mqtt_publisher.publish(availability_topic, "online", retain=True)
-                        state_topic = f"blupow/{device.mac_address}/state"
                         self._mqtt_publisher.publish(state_topic, json.dumps(data))
                     else:
-                        _LOGGER.warning(f"No data received from poll for device {address}. Setting to offline.")
+                        _LOGGER.warning("No data received from poll for device %s. Setting to offline.", address)
                         if self._mqtt_publisher:
                             self._mqtt_publisher.publish(availability_topic, "offline", retain=True)
                 except Exception:
-                    _LOGGER.exception(f"Unhandled exception while polling {address}. Setting to offline.")
+                    _LOGGER.exception("Unhandled exception while polling %s. Setting to offline.", address)
                     if self._mqtt_publisher:
                         self._mqtt_publisher.publish(availability_topic, "offline", retain=True)
                 
@@ -117,21 +115,21 @@ class DeviceManager:
 
         task = self._loop.create_task(polling_loop())
         self.polling_tasks[address] = task
-        _LOGGER.info(f"Polling task for {address} successfully created.")
+        _LOGGER.info("Polling task for %s started (interval %ss).", address, self.polling_interval)
 
     def stop_polling_device(self, address: str):
         """Stops the polling task for a specific device."""
         address = address.upper()
         if address in self.polling_tasks:
-            _LOGGER.info(f"Cancelling polling task for {address}")
+            _LOGGER.info("Cancelling polling task for %s", address)
             self.polling_tasks[address].cancel()
             del self.polling_tasks[address]
             if self._mqtt_publisher:
                 availability_topic = f"blupow/{address}/status"
                 self._mqtt_publisher.publish(availability_topic, "offline", retain=True)
-            _LOGGER.info(f"Polling task for {address} cancelled and set to offline.")
+            _LOGGER.info("Polling task for %s cancelled and set to offline.", address)
         else:
-            _LOGGER.warning(f"No polling task found to stop for {address}")
+            _LOGGER.warning("No polling task found to stop for %s", address)
 
     async def add_device(self, address: str, device_type: str) -> Dict[str, Any]:
         """Adds a new device, tests connection, and starts polling."""
@@ -145,7 +143,7 @@ class DeviceManager:
         
         device = self.create_device(address, device_type, {}, ble_device)
         
-        _LOGGER.info(f"Testing connection to new device {address}...")
+        _LOGGER.info("Testing connection to new device %s...", address)
         # Add a small delay to allow the device to be ready for a connection
         await asyncio.sleep(1.0)
         connected = await device.test_connection()
@@ -154,11 +152,11 @@ class DeviceManager:
             await device.disconnect() # Ensure cleanup
             raise ConnectionError("Connection test failed for the new device.")
         
-        _LOGGER.info(f"Connection test successful for {address}.")
+        _LOGGER.info("Connection test successful for %s.", address)
         self.devices[address] = device
         self.save_devices_to_config()
         await self.start_polling_device(device, publish_discovery=True)
-        _LOGGER.info(f"Successfully added and started polling for new device: {address}")
+        _LOGGER.info("Successfully added and started polling for new device: %s", address)
         return device.get_device_info()
 
     async def remove_device(self, address: str):
@@ -170,12 +168,13 @@ class DeviceManager:
         self.stop_polling_device(address)
         
         device_to_remove = self.devices[address]
+        await device_to_remove.disconnect() # Drivers keep their connection open between polls
         if self._mqtt_publisher:
             self._mqtt_publisher.clear_device_topics(device_to_remove)
 
         del self.devices[address]
         self.save_devices_to_config()
-        _LOGGER.info(f"Successfully removed device {address}")
+        _LOGGER.info("Successfully removed device %s", address)
 
     async def discover_devices(self) -> List[Dict[str, str]]:
         """Scans for BLE devices and returns a list of new discoveries."""
@@ -189,9 +188,10 @@ class DeviceManager:
                 discovered = await BleakScanner.discover(timeout=timeout)
                 self.discovered_device_cache.clear()
                 for device in discovered:
-                    self.discovered_device_cache[device.address] = device
+                    # Key by the normalized address so lookups are a single dict hit
+                    self.discovered_device_cache[device.address.upper()] = device
                 
-                _LOGGER.info(f"Scan attempt {attempt + 1} complete. Found {len(self.discovered_device_cache)} devices.")
+                _LOGGER.info("Scan attempt %s complete. Found %s devices.", attempt + 1, len(self.discovered_device_cache))
                 
                 # If we found devices, break out of the retry loop
                 if self.discovered_device_cache:
@@ -199,23 +199,23 @@ class DeviceManager:
                     
                 # If no devices found and we have more retries, wait a bit before retrying
                 if attempt < max_retries - 1:
-                    _LOGGER.info(f"No devices found in attempt {attempt + 1}. Retrying in 2 seconds...")
+                    _LOGGER.info("No devices found in attempt %s. Retrying in 2 seconds...", attempt + 1)
                     await asyncio.sleep(2.0)
                     
             except BleakError as e:
-                _LOGGER.error(f"Error during BLE scan attempt {attempt + 1}: {e}")
+                _LOGGER.error("Error during BLE scan attempt %s: %s", attempt + 1, e)
                 if attempt < max_retries - 1:
                     _LOGGER.info("Retrying in 2 seconds...")
                     await asyncio.sleep(2.0)
                 else:
                     return []
         
-        _LOGGER.info(f"Final scan complete. Found {len(self.discovered_device_cache)} devices.")
+        _LOGGER.info("Final scan complete. Found %s devices.", len(self.discovered_device_cache))
         
         return [
             {"name": d.name or "Unknown", "address": d.address}
-            for d in self.discovered_device_cache.values()
-            if d.address not in self.devices
+            for address, d in self.discovered_device_cache.items()
+            if address not in self.devices
         ]
 
     async def shutdown(self):
@@ -1,16 +1,45 @@
 import asyncio
+import os
+import struct
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Union
 from bleak import BleakClient, BleakScanner
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+# BlueZ only has a few connection slots; connecting to too many devices at once
+# fails with "connection slot" errors, so concurrent connects are capped across drivers.
+MAX_CONCURRENT_CONNECTIONS = int(os.getenv("MAX_CONCURRENT_CONNECTIONS", 3))
+if MAX_CONCURRENT_CONNECTIONS < 1:
+    raise ValueError(f"MAX_CONCURRENT_CONNECTIONS must be at least 1, got {MAX_CONCURRENT_CONNECTIONS}")
+
+# Created on first use: on Python 3.9 a semaphore binds to the event loop current at
+# construction, so one made at import time breaks under any other loop.
+_connect_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _get_connect_semaphore() -> asyncio.Semaphore:
+    """Return the connection semaphore shared by all drivers on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _connect_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _connect_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+    return semaphore
+
+# Modbus response header: device ID, function code, byte count
+_MODBUS_HEADER = struct.Struct('>BBB')
+
 class BaseDevice(ABC):
     """Abstract base class for all BluPow device drivers."""
 
+    # GATT characteristics used for Modbus requests and responses, set by each driver
+    notify_uuid: str
+    write_uuid: str
+
     def __init__(self, address: str, device_type: str, ble_device: Optional[BLEDevice] = None):
         """
         Initialize the base device.
@@ -22,6 +51,13 @@ class BaseDevice(ABC):
         self._device_type = device_type
         self._client: Optional[BleakClient] = None
         self._ble_device = ble_device # Cache the discovered device object
+        self._characteristics: Dict[str, BleakGATTCharacteristic] = {} # Resolved per connection
+        self._pending_response: Optional[asyncio.Future] = None # Outstanding request, if any
+        self._pending_byte_count = 0 # Byte count the outstanding request expects in its reply
+        self._pending_parse: Optional[Callable[[memoryview], Any]] = None # Parser for its reply, if any
+        # Byte count of a request that timed out. Its reply may still arrive, and since Modbus
+        # replies don't echo the register it would otherwise complete the next request.
+        self._late_byte_count: Optional[int] = None
 
     @property
     def is_connected(self) -> bool:
@@ -43,45 +79,153 @@ class BaseDevice(ABC):
         for attempt in range(retries):
             try:
                 if self._client and self._client.is_connected:
-                    _LOGGER.debug(f"[{self.mac_address}] Already connected.")
+                    _LOGGER.debug("[%s] Already connected.", self.mac_address)
                     return True
                 
-                _LOGGER.info(f"[{self.mac_address}] Attempting to connect (Attempt {attempt + 1}/{retries})...")
+                _LOGGER.info("[%s] Attempting to connect (Attempt %s/%s)...", self.mac_address, attempt + 1, retries)
                 
-                # Use the cached BLEDevice object if available, otherwise scan
-                device_to_connect = self._ble_device
-                if not device_to_connect:
-                    _LOGGER.debug(f"[{self.mac_address}] No cached device, scanning for address...")
-                    device_to_connect = await BleakScanner.find_device_by_address(self.mac_address, timeout=20.0)
-                
-                if not device_to_connect:
-                    _LOGGER.warning(f"[{self.mac_address}] Device not found.")
-                    raise BleakError(f"Device {self.mac_address} not found")
-                
-                self._client = BleakClient(device_to_connect)
-                await self._client.connect(timeout=30.0)
-                _LOGGER.info(f"[{self.mac_address}] Connection successful.")
+                # Hold a slot only while scanning/connecting, not during the retry delay
+                async with _get_connect_semaphore():
+                    # Use the cached BLEDevice object if available, otherwise scan
+                    device_to_connect = self._ble_device
+                    if not device_to_connect:
+                        _LOGGER.debug("[%s] No cached device, scanning for address...", self.mac_address)
+                        device_to_connect = await BleakScanner.find_device_by_address(self.mac_address, timeout=20.0)
+                    
+                    if not device_to_connect:
+                        _LOGGER.warning("[%s] Device not found.", self.mac_address)
+                        raise BleakError(f"Device {self.mac_address} not found")
+                    # Keep the scan result so later reconnects skip the scan
+                    self._ble_device = device_to_connect
+                    
+                    self._client = BleakClient(device_to_connect)
+                    self._characteristics.clear()
+                    self._late_byte_count = None
+                    await self._client.connect(timeout=30.0)
+                _LOGGER.info("[%s] Connection successful.", self.mac_address)
                 return True
-            except BleakError as e:
-                _LOGGER.error(f"[{self.mac_address}] Connection attempt {attempt + 1} failed: {e}")
+            except (BleakError, asyncio.TimeoutError) as e: # BlueZ raises TimeoutError when connect() times out
+                _LOGGER.error("[%s] Connection attempt %s failed: %r", self.mac_address, attempt + 1, e)
+                # The cached device may be stale (e.g. dropped by BlueZ); rescan on the next attempt
+                self._ble_device = None
                 if attempt < retries - 1:
                     await asyncio.sleep(delay)
         
-        _LOGGER.error(f"[{self.mac_address}] All connection attempts failed.")
+        _LOGGER.error("[%s] All connection attempts failed.", self.mac_address)
         return False
     
     async def disconnect(self):
         """Disconnect the BleakClient if it's connected."""
         if self._client and self._client.is_connected:
             await self._client.disconnect()
-            _LOGGER.info(f"[{self.mac_address}] Disconnected.")
+            _LOGGER.info("[%s] Disconnected.", self.mac_address)
         self._client = None
+        self._characteristics.clear()
+        self._late_byte_count = None
+
+    def _get_characteristic(self, uuid: str) -> Union[BleakGATTCharacteristic, str]:
+        """
+        Resolve a characteristic UUID once per connection so Bleak doesn't re-scan the
+        services on every read/write. Falls back to the UUID if it can't be resolved.
+        """
+        char = self._characteristics.get(uuid)
+        if char is None:
+            if self._client is None:
+                return uuid
+            char = self._client.services.get_characteristic(uuid)
+            if char is None:
+                return uuid
+            self._characteristics[uuid] = char
+        return char
+
+    async def _send_request(self, command: bytes, timeout: float, byte_count: int, response: Optional[bool] = None,
+                            parse: Optional[Callable[[memoryview], Any]] = None) -> Any:
+        """
+        Write a request and wait for its response.
+        :param byte_count: The data byte count of the expected reply (words * 2).
+        :param parse: Optional parser for the reply frame; its result is returned instead of the frame.
+        The driver's notification handler completes the request via _resolve_pending().
+        Returns None if the device answered with a Modbus exception or the reply couldn't be parsed.
+        """
+        assert self._client is not None
+        future = asyncio.get_running_loop().create_future()
+        self._pending_response = future
+        self._pending_byte_count = byte_count
+        self._pending_parse = parse
+        # If an older late reply is still expected, this request's own reply may be the one
+        # dropped in its place; don't mark it late as well or every later request would miss.
+        late_before = self._late_byte_count
+        try:
+            await self._client.write_gatt_char(self._get_characteristic(self.write_uuid), command, response=response)
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            if late_before is None:
+                self._late_byte_count = byte_count
+            raise
+        finally:
+            self._pending_response = None
+            self._pending_parse = None
+
+    def _resolve_pending(self, frame: bytearray):
+        """
+        Complete the outstanding request with the frame, or with what its parser made of it.
+        Only a 0x03 reply carrying the byte count the request asked for is accepted, and the
+        first reply after a timeout is dropped as the late answer to the timed-out request.
+        A Modbus exception reply, or a reply shorter than its byte count says, completes
+        the request with None.
+        """
+        if len(frame) < _MODBUS_HEADER.size:
+            _LOGGER.debug("[%s] Dropping runt response.", self.mac_address)
+            return
+        _, function_code, byte_count = _MODBUS_HEADER.unpack_from(frame)
+        if function_code == 0x80 | 0x03:
+            # Exception reply: the device answered, so don't wait out the timeout. The third
+            # byte is the exception code, not a byte count.
+            if _LOGGER.isEnabledFor(logging.WARNING):
+                _LOGGER.warning("[%s] Device returned Modbus exception %s: %s", self.mac_address, byte_count, frame.hex())
+            future = self._pending_response
+            if future is not None and not future.done():
+                self._late_byte_count = None # Replies arrive in order, so an older one won't come now
+                future.set_result(None)
+            return
+        if function_code != 0x03:
+            _LOGGER.debug("[%s] Dropping non-read response.", self.mac_address)
+            return
+        if byte_count == self._late_byte_count:
+            # The device answers in order, so this is the reply to the request that timed out
+            self._late_byte_count = None
+            _LOGGER.debug("[%s] Dropping late response to a timed-out request.", self.mac_address)
+            return
+        future = self._pending_response
+        if future is None or future.done():
+            return
+        if byte_count != self._pending_byte_count:
+            _LOGGER.debug("[%s] Dropping response that doesn't match the pending request.", self.mac_address)
+            return
+        self._late_byte_count = None # Replies arrive in order, so an older one won't come now
+        if len(frame) < _MODBUS_HEADER.size + byte_count + 2: # Header, data and CRC
+            # It answers this request, but parsers read at fixed offsets and must not see it
+            if _LOGGER.isEnabledFor(logging.WARNING):
+                _LOGGER.warning("[%s] Received truncated response: %s", self.mac_address, frame.hex())
+            future.set_result(None)
+            return
+        result = frame
+        if self._pending_parse is not None:
+            try:
+                # Bleak hands us a fresh buffer per notification, so parse it in place
+                result = self._pending_parse(memoryview(frame))
+            except Exception:
+                result = None # Malformed frame
+                if _LOGGER.isEnabledFor(logging.WARNING):
+                    _LOGGER.warning("[%s] Could not parse received data: %s", self.mac_address, frame.hex())
+        future.set_result(result)
 
     @abstractmethod
     async def poll(self) -> Optional[Dict[str, Any]]:
         """
         Poll the device for its current state and data.
-        This method should handle connection, data retrieval, and disconnection.
+        This method should (re)connect as needed and retrieve the data. Drivers keep
+        the connection open between polls and only disconnect after an error.
         It must be implemented by all subclasses.
 
         Returns:
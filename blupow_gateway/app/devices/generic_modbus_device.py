@@ -1,14 +1,14 @@
 import asyncio
 import logging
+import struct
 from typing import Any, Dict, Optional, List
-from functools import partial
 
 from bleak import BleakClient, BleakScanner
 from bleak.exc import BleakError
 from bleak.backends.device import BLEDevice
 
 from .base import BaseDevice
-from ..utils import _calculate_crc, _bytes_to_int
+from ..utils import _build_read_command, _bytes_to_int
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,16 +33,14 @@ class GenericModbusDevice(BaseDevice):
         self.device_id = self.config.get("device_id", 1)
         self.notify_uuid = self.config["notify_uuid"]
         self.write_uuid = self.config["write_uuid"]
-        self._data_buffer: Dict[str, Any] = {}
-        self._notification_event = asyncio.Event()
 
     def _validate_config(self, config: Dict[str, Any]) -> bool:
         """Basic validation of the device's JSON configuration."""
         if not all(k in config for k in ["notify_uuid", "write_uuid", "sensors"]):
-            _LOGGER.error(f"[{self.mac_address}] Config missing required keys: notify_uuid, write_uuid, sensors")
+            _LOGGER.error("[%s] Config missing required keys: notify_uuid, write_uuid, sensors", self.mac_address)
             return False
         if not isinstance(config["sensors"], list) or not config["sensors"]:
-            _LOGGER.error(f"[{self.mac_address}] 'sensors' must be a non-empty list.")
+            _LOGGER.error("[%s] 'sensors' must be a non-empty list.", self.mac_address)
             return False
         return True
 
@@ -52,84 +50,76 @@ class GenericModbusDevice(BaseDevice):
 
     async def test_connection(self) -> bool:
         """Test the BLE connection to the device."""
-        _LOGGER.info(f"Testing connection to Generic Modbus Device at {self.mac_address}")
+        _LOGGER.info("Testing connection to Generic Modbus Device at %s", self.mac_address)
         is_connected = await self.connect()
         if is_connected:
             await self.disconnect()
         return is_connected
 
     async def poll(self) -> Optional[Dict[str, Any]]:
-        _LOGGER.debug(f"[{self.mac_address}] Starting generic data fetch process.")
+        _LOGGER.debug("[%s] Starting generic data fetch process.", self.mac_address)
         if not await self.connect():
-            _LOGGER.error(f"[{self.mac_address}] Could not connect for polling.")
+            _LOGGER.error("[%s] Could not connect for polling.", self.mac_address)
             return None
 
         try:
             assert self._client is not None
             client = self._client
             
-            self._data_buffer.clear()
+            # Responses are matched to requests by the per-request future, so one subscription serves every sensor
+            await client.start_notify(self._get_characteristic(self.notify_uuid), self._notification_handler)
+
+            data: Dict[str, Any] = {}
             # For this generic driver, we read one register at a time per sensor definition
             for sensor in self.get_sensor_definitions():
                 try:
                     reg = sensor['register']
                     words = sensor.get('words', 1) # Default to reading 1 word (2 bytes)
+
+                    command = _build_read_command(self.device_id, reg, words)
+                    response = await self._send_request(command, READ_TIMEOUT, words * 2, response=False)
+                    if response is not None: # None: the device rejected the read
+                        self._parse_response(response, sensor, data)
                     
-                    # Create a specific handler for this sensor request
-                    handler = partial(self._notification_handler, sensor_def=sensor)
-                    await client.start_notify(self.notify_uuid, handler)
-
-                    command = self._build_modbus_command(reg, words)
-                    self._notification_event.clear()
-                    await client.write_gatt_char(self.write_uuid, command, response=False)
-                    await asyncio.wait_for(self._notification_event.wait(), timeout=READ_TIMEOUT)
-                    
-                    await client.stop_notify(self.notify_uuid)
-                    
-                except (KeyError, TypeError):
-                    _LOGGER.warning(f"[{self.mac_address}] Skipping malformed sensor definition: {sensor}")
+                except (KeyError, TypeError, struct.error): # struct.error: register or word count out of range
+                    _LOGGER.warning("[%s] Skipping malformed sensor definition: %s", self.mac_address, sensor)
                     continue
                 except asyncio.TimeoutError:
-                     _LOGGER.warning(f"[{self.mac_address}] Timeout waiting for notification for register {reg}.")
+                     _LOGGER.warning("[%s] Timeout waiting for notification for register %s.", self.mac_address, reg)
                      continue # Try the next sensor
 
-            return self._data_buffer
+            await client.stop_notify(self._get_characteristic(self.notify_uuid))
+            return data
 
         except (BleakError) as e:
-            _LOGGER.error(f"[{self.mac_address}] Connection or Bleak-level error: {e}")
+            _LOGGER.error("[%s] Connection or Bleak-level error: %s", self.mac_address, e)
+            await self.disconnect() # Reconnect from scratch on the next poll
             return None
         except Exception as e:
-            _LOGGER.error(f"[{self.mac_address}] An unexpected error occurred: {e}", exc_info=True)
-            return None
-        finally:
+            _LOGGER.error("[%s] An unexpected error occurred: %s", self.mac_address, e, exc_info=True)
             await self.disconnect()
+            return None
+
+    def _notification_handler(self, sender, data: bytearray):
+        """Hand the raw response to the request waiting for it."""
+        # Bleak passes a fresh bytearray per notification, so it's safe to keep without copying
+        self._resolve_pending(data)
 
-    def _notification_handler(self, sender, data: bytearray, sensor_def: Dict[str, Any]):
-        """Handle incoming notifications and parse them based on a specific sensor definition."""
-        _LOGGER.debug(f"[{self.mac_address}] Received notification for {sensor_def['key']}: {data.hex()}")
+    def _parse_response(self, data: bytearray, sensor_def: Dict[str, Any], result: Dict[str, Any]):
+        """Parse a response based on a specific sensor definition and store it in result."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("[%s] Received notification for %s: %s", self.mac_address, sensor_def['key'], data.hex())
         
         response_words = (len(data) - 5) // 2
         expected_words = sensor_def.get('words', 1)
 
         if response_words != expected_words:
-            _LOGGER.warning(f"[{self.mac_address}] Received data of unexpected length ({len(data)}) for sensor {sensor_def['key']}.")
+            _LOGGER.warning("[%s] Received data of unexpected length (%s) for sensor %s.", self.mac_address, len(data), sensor_def['key'])
         else:
             try:
-                value = _bytes_to_int(bytes(data), 3, response_words * 2, 
+                value = _bytes_to_int(data, 3, response_words * 2, 
                                       signed=sensor_def.get('signed', False), 
                                       scale=sensor_def.get('scale', 1.0))
-                self._data_buffer[sensor_def['key']] = value
+                result[sensor_def['key']] = value
             except (KeyError, TypeError) as e:
-                _LOGGER.warning(f"[{self.mac_address}] Error parsing sensor {sensor_def.get('key')}: {e}")
-
-        self._notification_event.set()
-
-    def _build_modbus_command(self, start_register: int, count: int) -> bytes:
-        command = bytearray([
-            self.device_id, 0x03,
-            (start_register >> 8) & 0xFF, start_register & 0xFF,
-            (count >> 8) & 0xFF, count & 0xFF
-        ])
-        crc = _calculate_crc(bytes(command))
-        command.extend(crc)
-        return bytes(command) 
\ No newline at end of file
+                _LOGGER.warning("[%s] Error parsing sensor %s: %s", self.mac_address, sensor_def.get('key'), e)
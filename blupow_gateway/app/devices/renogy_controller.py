@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import struct
 from typing import Any, Dict, Optional, List
 
 from bleak import BleakClient, BleakScanner
@@ -7,7 +8,7 @@ from bleak.exc import BleakError
 from bleak.backends.device import BLEDevice
 
 from .base import BaseDevice
-from ..utils import _calculate_crc, _bytes_to_int, _parse_temperature
+from ..utils import _build_read_command, _bytes_to_int, _parse_temperature
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,21 +16,35 @@ _LOGGER = logging.getLogger(__name__)
 CONNECTION_TIMEOUT = 20.0
 READ_TIMEOUT = 15.0
 
+# Indexed by the raw state code
+CHARGING_STATES = ('deactivated', 'activated', 'mppt', 'equalizing', 'boost', 'floating', 'current limiting')
+LOAD_STATES = ('off', 'on')
+BATTERY_TYPE_MAP = {1: 'open', 2: 'sealed', 3: 'gel', 4: 'lithium', 5: 'custom'}
+
+# Charging info block (registers 0x100-0x121), decoded from frame offset 3.
+# Unused registers are skipped with pad bytes.
+_CHARGING_INFO_STRUCT = struct.Struct('>HHHBBHHHHHH14xHHHH14xI4xBB')
+
 class RenogyController(BaseDevice):
     """Driver for Renogy solar charge controllers."""
 
+    # Fixed for every controller, so shared by all instances
+    notify_uuid = "0000fff1-0000-1000-8000-00805f9b34fb"
+    write_uuid = "0000ffd1-0000-1000-8000-00805f9b34fb"
+
+    # (start register, word count, parser method name) for each block read per poll
+    SECTIONS = (
+        (12, 8, '_parse_device_info'),
+        (256, 34, '_parse_charging_info'),
+        (57348, 1, '_parse_battery_type'),
+    )
+
     def __init__(self, address: str, device_type: str, config: dict, ble_device: Optional[BLEDevice] = None):
         super().__init__(address, device_type, ble_device)
         self.device_id = 1  # Modbus ID for controllers
-        self.notify_uuid = "0000fff1-0000-1000-8000-00805f9b34fb"
-        self.write_uuid = "0000ffd1-0000-1000-8000-00805f9b34fb"
-        self.sections = [
-            {'register': 12, 'words': 8, 'parser': self._parse_device_info},
-            {'register': 256, 'words': 34, 'parser': self._parse_charging_info},
-            {'register': 57348, 'words': 1, 'parser': self._parse_battery_type},
-        ]
-        self._data_buffer: Dict[str, Any] = {}
-        self._notification_event = asyncio.Event()
+        self.sections = tuple(
+            (register, words, getattr(self, parser)) for register, words, parser in self.SECTIONS
+        )
 
     def get_sensor_definitions(self) -> List[Dict[str, Any]]:
         """Return the sensor definitions for the Renogy Controller."""
@@ -61,124 +76,91 @@ class RenogyController(BaseDevice):
         ]
 
     async def poll(self) -> Optional[Dict[str, Any]]:
-        _LOGGER.debug(f"[{self.mac_address}] Starting data fetch process.")
+        _LOGGER.debug("[%s] Starting data fetch process.", self.mac_address)
         
         try:
             if not self.is_connected:
-                _LOGGER.info(f"[{self.mac_address}] Not connected, establishing connection.")
+                _LOGGER.info("[%s] Not connected, establishing connection.", self.mac_address)
                 if not await self.connect():
-                    _LOGGER.error(f"Could not connect to {self.mac_address} for polling.")
+                    _LOGGER.error("Could not connect to %s for polling.", self.mac_address)
                     return None
             
             assert self._client is not None # Should be connected here
 
             # Ensure notifications are enabled
-            await self._client.start_notify(self.notify_uuid, self._notification_handler)
+            await self._client.start_notify(self._get_characteristic(self.notify_uuid), self._notification_handler)
 
-            self._data_buffer.clear()
-            all_data = {}
-            for section in self.sections:
+            all_data: Dict[str, Any] = {}
+            for register, words, parser in self.sections:
                 try:
-                    command = self._build_modbus_command(section['register'], section['words'])
-                    self._notification_event.clear()
-                    await self._client.write_gatt_char(self.write_uuid, command, response=False)
-                    await asyncio.wait_for(self._notification_event.wait(), timeout=READ_TIMEOUT)
-                    # Data from the handler is placed in _data_buffer, let's merge it
-                    all_data.update(self._data_buffer)
+                    command = _build_read_command(self.device_id, register, words)
+                    # The reply is run through this section's parser; None if it was rejected or malformed
+                    section_data = await self._send_request(command, READ_TIMEOUT, words * 2, response=False, parse=parser)
+                    if section_data:
+                        all_data.update(section_data)
                 except asyncio.TimeoutError:
-                    _LOGGER.warning(f"[{self.mac_address}] Timeout polling register {section['register']}. Skipping.")
+                    _LOGGER.warning("[%s] Timeout polling register %s. Skipping.", self.mac_address, register)
                     continue # Try the next section
             
             # Stop notifications to save battery, but keep the connection alive.
-            await self._client.stop_notify(self.notify_uuid)
+            await self._client.stop_notify(self._get_characteristic(self.notify_uuid))
 
             return all_data if all_data else None
 
         except BleakError as e:
-            _LOGGER.error(f"[{self.mac_address}] BleakError during poll: {e}. Disconnecting.")
+            _LOGGER.error("[%s] BleakError during poll: %s. Disconnecting.", self.mac_address, e)
             await self.disconnect() # Force disconnect on BleakError
             return None
         except Exception as e:
-            _LOGGER.error(f"[{self.mac_address}] An unexpected error occurred during poll: {e}", exc_info=True)
+            _LOGGER.error("[%s] An unexpected error occurred during poll: %s", self.mac_address, e, exc_info=True)
             await self.disconnect()
             return None
 
     def _notification_handler(self, sender, data: bytearray):
-        _LOGGER.debug(f"[{self.mac_address}] Received notification: {data.hex()}")
-        # We don't know which request this response is for, so we try all parsers
-        # This is less efficient but more robust if responses arrive out of order.
-        parser_found = False
-        for section in self.sections:
-            # A simple length check is a good first-pass filter
-            if len(data) >= 5: # Minimum length of a modbus frame
-                try:
-                    # Pass immutable bytes to parsers
-                    parsed_data = section['parser'](bytes(data))
-                    if parsed_data: # If parser returns data, we assume it was the right one
-                        self._data_buffer.clear() # Clear previous partial data
-                        self._data_buffer.update(parsed_data)
-                        parser_found = True
-                        break
-                except Exception:
-                    # This parser didn't work, try the next one
-                    continue
-        
-        if not parser_found:
-            _LOGGER.warning(f"[{self.mac_address}] Could not parse received data: {data.hex()}")
-
-        self._notification_event.set()
-
-    def _build_modbus_command(self, start_register: int, count: int) -> bytes:
-        command = bytearray([
-            self.device_id, 0x03,
-            (start_register >> 8) & 0xFF, start_register & 0xFF,
-            (count >> 8) & 0xFF, count & 0xFF
-        ])
-        crc = _calculate_crc(bytes(command))
-        command.extend(crc)
-        return bytes(command)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("[%s] Received notification: %s", self.mac_address, data.hex())
+        self._resolve_pending(data)
 
     # --- Parsers ---
+    # Each is passed to _send_request for its section, and only 0x03 replies with that section's
+    # byte count reach it (see BaseDevice._resolve_pending), so they read at fixed offsets.
     def _parse_device_info(self, bs: bytes) -> Dict[str, Any]:
-        return {'model': (bs[3:19]).decode('utf-8', 'ignore').strip().rstrip('\x00')}
+        # The model may be padded with spaces and NULs in either order
+        return {'model': bytes(bs[3:19]).strip(b' \x00').decode('utf-8', 'ignore')}
 
     def _parse_charging_info(self, bs: bytes) -> Dict[str, Any]:
-        # Basic validation: Check function code (0x03) and byte count
-        if len(bs) < 5 or bs[1] != 0x03 or bs[2] != 68: # 34 words * 2 = 68 bytes
-            return {}
-        charging_state_map = {0: 'deactivated', 1: 'activated', 2: 'mppt', 3: 'equalizing', 4: 'boost', 5: 'floating', 6: 'current limiting'}
-        load_state_map = {0: 'off', 1: 'on'}
+        (battery_soc, battery_voltage, battery_current, controller_temp, battery_temp,
+         load_voltage, load_current, load_power, solar_voltage, solar_current, solar_power,
+         charging_ah_today, discharging_ah_today, generation_today, consumption_today,
+         generation_total, load_state, charging_state) = _CHARGING_INFO_STRUCT.unpack_from(bs, 3)
+        # Published as floats, like every other numeric field of this block
         return {
-            'battery_soc': _bytes_to_int(bs, 3, 2),
-            'battery_voltage': _bytes_to_int(bs, 5, 2, scale=0.1),
-            'battery_current': _bytes_to_int(bs, 7, 2, scale=0.01),
-            'battery_temperature': _parse_temperature(int(_bytes_to_int(bs, 10, 1))),
-            'controller_temperature': _parse_temperature(int(_bytes_to_int(bs, 9, 1))),
-            'load_status': load_state_map.get(int(_bytes_to_int(bs, 67, 1)) >> 7, 'unknown'),
-            'load_voltage': _bytes_to_int(bs, 11, 2, scale=0.1),
-            'load_current': _bytes_to_int(bs, 13, 2, scale=0.01),
-            'load_power': _bytes_to_int(bs, 15, 2),
-            'solar_voltage': _bytes_to_int(bs, 17, 2, scale=0.1),
-            'solar_current': _bytes_to_int(bs, 19, 2, scale=0.01),
-            'solar_power': _bytes_to_int(bs, 21, 2),
-            'charging_amp_hours_today': _bytes_to_int(bs, 37, 2),
-            'discharging_amp_hours_today': _bytes_to_int(bs, 39, 2),
-            'power_generation_today': _bytes_to_int(bs, 41, 2, scale=0.001), # Wh -> kWh
-            'power_consumption_today': _bytes_to_int(bs, 43, 2, scale=0.001), # Wh -> kWh
-            'power_generation_total': _bytes_to_int(bs, 59, 4, scale=0.001), # Wh -> kWh
-            'charging_status': charging_state_map.get(int(_bytes_to_int(bs, 68, 1)), 'unknown'),
+            'battery_soc': float(battery_soc),
+            'battery_voltage': battery_voltage * 0.1,
+            'battery_current': battery_current * 0.01,
+            'battery_temperature': _parse_temperature(battery_temp),
+            'controller_temperature': _parse_temperature(controller_temp),
+            'load_status': LOAD_STATES[load_state >> 7], # Top bit of a byte, always 0 or 1
+            'load_voltage': load_voltage * 0.1,
+            'load_current': load_current * 0.01,
+            'load_power': float(load_power),
+            'solar_voltage': solar_voltage * 0.1,
+            'solar_current': solar_current * 0.01,
+            'solar_power': float(solar_power),
+            'charging_amp_hours_today': float(charging_ah_today),
+            'discharging_amp_hours_today': float(discharging_ah_today),
+            'power_generation_today': generation_today * 0.001, # Wh -> kWh
+            'power_consumption_today': consumption_today * 0.001, # Wh -> kWh
+            'power_generation_total': generation_total * 0.001, # Wh -> kWh
+            'charging_status': CHARGING_STATES[charging_state] if charging_state < len(CHARGING_STATES) else 'unknown',
         }
 
     def _parse_battery_type(self, bs: bytes) -> Dict[str, Any]:
-        # Basic validation: Check function code (0x03) and byte count
-        if len(bs) < 5 or bs[1] != 0x03 or bs[2] != 2: # 1 word * 2 = 2 bytes
-            return {}
-        battery_type_map = {1: 'open', 2: 'sealed', 3: 'gel', 4: 'lithium', 5: 'custom'}
-        return {'battery_type': battery_type_map.get(int(_bytes_to_int(bs, 3, 2)), 'unknown')}
+        return {'battery_type': BATTERY_TYPE_MAP.get(int(_bytes_to_int(bs, 3, 2)), 'unknown')}
 
     async def test_connection(self) -> bool:
         """Test the BLE connection to the controller."""
-        _LOGGER.info(f"Testing connection to Renogy Controller at {self.mac_address}")
+        _LOGGER.info("Testing connection to Renogy Controller at %s", self.mac_address)
         is_connected = await self.connect()
         if is_connected:
             await self.disconnect()
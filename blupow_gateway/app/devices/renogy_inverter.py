@@ -9,6 +9,7 @@ from bleak import BleakClient
 from bleak.backends.device import BLEDevice
 
 from .base import BaseDevice
+from ..utils import _build_read_command, _calculate_crc
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,19 +35,11 @@ RENOGY_INVERTER_SENSORS = [
     {'key': 'device_id', 'name': 'Device ID'}
 ]
 
-def crc16(data: bytes) -> bytes:
-    """
-    Calculates the CRC-16-MODBUS checksum for the given data.
-    """
-    crc = 0xFFFF
-    for byte in data:
-        crc ^= byte
-        for _ in range(8):
-            if crc & 0x0001:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return crc.to_bytes(2, 'little')
+# Precompiled decoders for the fixed-size register blocks (big-endian words)
+_INVERTER_STATS_STRUCT = struct.Struct('>10H')
+_DEVICE_ID_STRUCT = struct.Struct('>H')
+_CHARGING_INFO_STRUCT = struct.Struct('>7H')
+_LOAD_INFO_STRUCT = struct.Struct('>6H')
 
 
 class RenogyInverter(BaseDevice):
@@ -55,11 +48,12 @@ class RenogyInverter(BaseDevice):
     This is a placeholder implementation.
     """
 
+    # Fixed for every inverter, so shared by all instances
+    notify_uuid = "0000ffd2-0000-1000-8000-00805f9b34fb"
+    write_uuid = "0000ffd1-0000-1000-8000-00805f9b34fb"
+
     def __init__(self, address: str, device_type: str, ble_device: Optional[BLEDevice] = None):
         super().__init__(address, device_type, ble_device)
-        # Inverter-specific UUIDs and details would go here
-        self.notify_uuid = "0000ffd2-0000-1000-8000-00805f9b34fb"
-        self.write_uuid = "0000ffd1-0000-1000-8000-00805f9b34fb"
         self.device_id = 1 # Per common Modbus standard
 
     def get_sensor_definitions(self) -> List[Dict[str, Any]]:
@@ -70,7 +64,7 @@ class RenogyInverter(BaseDevice):
         """Parse data from register 4000 (Inverter Stats). 10 words."""
         try:
             # Unpack 10 words (10x 16-bit unsigned integers, big-endian)
-            unpacked_data = struct.unpack('>HHHHHHHHHH', data)
+            unpacked_data = _INVERTER_STATS_STRUCT.unpack(data)
             return {
                 'input_voltage': unpacked_data[0] / 10.0,
                 'input_current': unpacked_data[1] / 100.0,
@@ -88,7 +82,7 @@ class RenogyInverter(BaseDevice):
     def _parse_device_id(self, data: bytes) -> Dict[str, Any]:
         """Parse data from register 4109 (Device ID). 1 word."""
         try:
-            return {'device_id': struct.unpack('>H', data)[0]}
+            return {'device_id': _DEVICE_ID_STRUCT.unpack(data)[0]}
         except struct.error:
             _LOGGER.warning("Failed to parse device ID, data length mismatch.")
             return {}
@@ -97,15 +91,15 @@ class RenogyInverter(BaseDevice):
         """Parse data from register 4311 (Model Info). 8 words."""
         try:
             # Attempt to decode as ASCII, ignoring errors
-            return {'model': data.decode('ascii', errors='ignore').strip('\x00')}
+            return {'model': str(data, 'ascii', errors='ignore').strip('\x00')}
         except Exception as e:
-            _LOGGER.warning(f"Failed to parse model info: {e}")
+            _LOGGER.warning("Failed to parse model info: %s", e)
             return {}
 
     def _parse_charging_info(self, data: bytes) -> Dict[str, Any]:
         """Parse data from register 4327 (Charging Info). 7 words."""
         try:
-            unpacked_data = struct.unpack('>HHHHHHH', data)
+            unpacked_data = _CHARGING_INFO_STRUCT.unpack(data)
             return {
                 'battery_voltage': unpacked_data[0] / 10.0,
                 'charging_current': unpacked_data[1] / 100.0,
@@ -121,7 +115,7 @@ class RenogyInverter(BaseDevice):
     def _parse_load_info(self, data: bytes) -> Dict[str, Any]:
         """Parse data from register 4408 (Load Info). 6 words."""
         try:
-            unpacked_data = struct.unpack('>HHHHHH', data)
+            unpacked_data = _LOAD_INFO_STRUCT.unpack(data)
             return {
                 'load_percentage': unpacked_data[3],
                 # Other load info can be extracted if mapping is known
@@ -132,56 +126,50 @@ class RenogyInverter(BaseDevice):
 
     async def poll(self) -> Optional[Dict[str, Any]]:
         """
-        Connects to the inverter, reads multiple registers, parses the data,
-        and returns the combined state.
+        Connects to the inverter if needed, reads multiple registers, parses the data,
+        and returns the combined state. The connection is kept open for the next poll.
         """
         all_data = {}
         if not await self.connect():
-            _LOGGER.error(f"Could not connect to {self.mac_address} for polling.")
+            _LOGGER.error("Could not connect to %s for polling.", self.mac_address)
             return None
         
         try:
             assert self._client is not None # Should be connected
             client = self._client
             
-            response_queue: asyncio.Queue[bytearray] = asyncio.Queue()
-
             def notification_handler(sender: BleakGATTCharacteristic, data: bytearray):
-                response_queue.put_nowait(data)
+                self._resolve_pending(data)
 
-            await client.start_notify(self.notify_uuid, notification_handler)
+            await client.start_notify(self._get_characteristic(self.notify_uuid), notification_handler)
 
-            async def read_register(register: int, words: int) -> Optional[bytes]:
-                # Frame: Device ID (1) + Func Code (1) + Register (2) + Words (2)
-                command = struct.pack('>BBHH', self.device_id, 3, register, words)
-                command_with_crc = command + crc16(command)
-                
-                # Clear queue before sending command
-                while not response_queue.empty():
-                    response_queue.get_nowait()
+            async def read_register(register: int, words: int) -> Optional[memoryview]:
+                command_with_crc = _build_read_command(self.device_id, register, words)
 
-                _LOGGER.debug(f"Sending command to {self.mac_address}: {command_with_crc.hex()}")
-                await client.write_gatt_char(self.write_uuid, command_with_crc)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Sending command to %s: %s", self.mac_address, command_with_crc.hex())
                 
                 try:
-                    # Wait for the notification with a timeout
-                    response = await asyncio.wait_for(response_queue.get(), timeout=5.0)
-                    _LOGGER.debug(f"Received response from {self.mac_address}: {response.hex()}")
+                    # Replies must carry the requested byte count, and a late reply to a timed-out read is dropped (see _resolve_pending)
+                    response = await self._send_request(command_with_crc, timeout=5.0, byte_count=words * 2)
+                    if response is None: return None # The device rejected the read
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug("Received response from %s: %s", self.mac_address, response.hex())
                     
                     # Basic validation: Device ID, func code, and CRC
                     if len(response) < 5: return None
                     if response[0] != self.device_id or response[1] != 3: return None
                     
-                    payload = response[:-2]
-                    received_crc = response[-2:]
-                    if crc16(bytes(payload)) != received_crc:
+                    # Zero-copy views: the CRC and the parsers both read straight from the response
+                    frame = memoryview(response)
+                    if _calculate_crc(frame[:-2]) != frame[-2:]:
                         _LOGGER.warning("CRC mismatch on received data")
                         return None
                     
-                    return bytes(payload[3:]) # Return just the data part
+                    return frame[3:-2] # Return just the data part
 
                 except asyncio.TimeoutError:
-                    _LOGGER.warning(f"Timeout waiting for response from register {register}")
+                    _LOGGER.warning("Timeout waiting for response from register %s", register)
                     return None
 
             # Read all required registers
@@ -200,19 +188,21 @@ class RenogyInverter(BaseDevice):
             load_data = await read_register(4408, 6)
             if load_data: all_data.update(self._parse_load_info(load_data))
 
-            await client.stop_notify(self.notify_uuid)
+            await client.stop_notify(self._get_characteristic(self.notify_uuid))
             
         except BleakError as e:
-            _LOGGER.error(f"Bluetooth error while polling {self.mac_address}: {e}")
+            _LOGGER.error("Bluetooth error while polling %s: %s", self.mac_address, e)
             all_data = None # Invalidate data on error
-        finally:
+            await self.disconnect() # Reconnect from scratch on the next poll
+        except Exception:
             await self.disconnect()
+            raise
             
         return all_data
 
     async def test_connection(self) -> bool:
         """Tests the connection to the device."""
-        _LOGGER.info(f"Testing connection to {self.mac_address}")
+        _LOGGER.info("Testing connection to %s", self.mac_address)
         is_connected = await self.connect()
         if is_connected:
             await self.disconnect()
@@ -18,7 +18,7 @@ _LOGGER = logging.getLogger(__name__)
 
 async def main(device_manager: DeviceManager, mqtt_handler: MqttHandler):
     """Main application entry point."""
-    _LOGGER.info(f"Starting BluPow Gateway v{GATEWAY_VERSION}")
+    _LOGGER.info("Starting BluPow Gateway v%s", GATEWAY_VERSION)
     
     # Load devices from config
     device_manager.load_devices_from_config()
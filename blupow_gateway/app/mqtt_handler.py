@@ -71,7 +71,7 @@ class MqttHandler:
                 availability_topic = f"blupow/{device.mac_address}/status"
                 self.publish(availability_topic, "online", retain=True)
         else:
-            _LOGGER.error(f"Failed to connect to MQTT broker, return code {rc}")
+            _LOGGER.error("Failed to connect to MQTT broker, return code %s", rc)
 
     def _on_message_sync(self, client, userdata, msg):
         """Sync wrapper to schedule the async message handler in the event loop."""
@@ -94,7 +94,7 @@ class MqttHandler:
                 await self._handle_command(command, data, request_id)
 
         except json.JSONDecodeError:
-            _LOGGER.warning(f"Could not decode MQTT message: {msg.payload.decode()}")
+            _LOGGER.warning("Could not decode MQTT message: %s", msg.payload.decode())
         except Exception:
             _LOGGER.exception("Unhandled error processing MQTT message")
 
@@ -129,7 +129,7 @@ class MqttHandler:
                 response_payload = {"status": "failure", "reason": "unknown_command"}
 
         except (KeyError, TypeError, ValueError, ConnectionError) as e:
-            _LOGGER.error(f"Error handling command '{command}': {e}")
+            _LOGGER.error("Error handling command '%s': %s", command, e)
             response_payload = {"status": "failure", "reason": str(e)}
         
         if request_id:
@@ -170,7 +170,7 @@ class MqttHandler:
             
     def clear_device_topics(self, device: BaseDevice):
         """Clears (un-publishes) the discovery topics for a device."""
-        _LOGGER.info(f"Clearing MQTT discovery topics for {device.mac_address}")
+        _LOGGER.info("Clearing MQTT discovery topics for %s", device.mac_address)
         mac_safe = device.mac_address.replace(":", "")
         for sensor in device.get_sensor_definitions():
             sensor_id = sensor["key"]
@@ -1,17 +1,41 @@
 import struct
+from functools import lru_cache
 
-def _calculate_crc(data: bytes) -> bytes:
-    """Calculate the CRC-16 for a byte array."""
-    crc = 0xFFFF
-    for byte in data:
-        crc ^= byte
+def _build_crc_table() -> tuple:
+    """Build the 256-entry lookup table for CRC-16/MODBUS (reflected poly 0xA001)."""
+    table = []
+    for byte in range(256):
+        crc = byte
         for _ in range(8):
             if crc & 1:
                 crc = (crc >> 1) ^ 0xA001
             else:
                 crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+_CRC_TABLE = _build_crc_table()
+
+# Device ID, function code, start register, register count (big-endian)
+_READ_REQUEST_STRUCT = struct.Struct('>BBHH')
+
+def _calculate_crc(data: bytes) -> bytes:
+    """Calculate the CRC-16 for a byte array."""
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
     return crc.to_bytes(2, byteorder='little')
 
+@lru_cache(maxsize=64)
+def _build_read_command(device_id: int, start_register: int, count: int) -> bytes:
+    """
+    Build a Modbus 'read holding registers' (0x03) request, including its CRC.
+    Drivers poll the same few register blocks forever, so finished frames are cached.
+    """
+    command = _READ_REQUEST_STRUCT.pack(device_id, 0x03, start_register, count)
+    return command + _calculate_crc(command)
+
 def _bytes_to_int(bs: bytes, offset: int, size: int, signed: bool = False, scale: float = 1.0) -> float:
     """Convert a byte slice to a scaled integer."""
     value = int.from_bytes(bs[offset:offset+size], byteorder='big', signed=signed)
@@ -25,4 +49,4 @@ def _parse_temperature(value: int, unit: str = "c") -> float:
     temp = (value & 0x7f) * (1 if (value >> 7 == 0) else -1)
     if unit == "f":
         return round(((temp * 9/5) + 32), 2)
-    return float(temp) 
\ No newline at end of file
+    return float(temp)
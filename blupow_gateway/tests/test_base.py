@@ -0,0 +1,18 @@
+import asyncio
+
+from app.devices.base import MAX_CONCURRENT_CONNECTIONS, _get_connect_semaphore
+
+
+def test_connect_semaphore_is_per_event_loop():
+    """Connects stay capped under each event loop without binding to the first one."""
+    async def contend():
+        semaphore = _get_connect_semaphore()
+        async def hold():
+            async with semaphore:
+                await asyncio.sleep(0)
+        # One more holder than the cap, so some acquires have to wait
+        await asyncio.gather(*(hold() for _ in range(MAX_CONCURRENT_CONNECTIONS + 1)))
+        assert _get_connect_semaphore() is semaphore
+        return semaphore
+
+    assert asyncio.run(contend()) is not asyncio.run(contend())
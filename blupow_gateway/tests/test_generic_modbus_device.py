@@ -0,0 +1,96 @@
+import asyncio
+import struct
+
+from app.devices import generic_modbus_device
+from app.devices.generic_modbus_device import GenericModbusDevice
+from app.utils import _calculate_crc
+
+
+def _reply(register: int) -> bytearray:
+    """A 1-word read reply whose value is the register number, so replies are traceable."""
+    body = struct.pack('>BBBH', 1, 0x03, 2, register)
+    return bytearray(body + _calculate_crc(body))
+
+
+def _exception_reply(code: int = 0x02) -> bytearray:
+    """A Modbus exception reply (function code 0x83), e.g. 0x02 for an illegal data address."""
+    body = struct.pack('>BBB', 1, 0x83, code)
+    return bytearray(body + _calculate_crc(body))
+
+
+def _make_driver(*registers: int) -> GenericModbusDevice:
+    sensors = [{'key': key, 'register': register} for key, register in zip('abc', registers)]
+    return GenericModbusDevice(
+        address="00:00:00:00:00:00", device_type="generic_modbus_device",
+        config={'notify_uuid': 'n', 'write_uuid': 'w', 'sensors': sensors},
+    )
+
+
+class _FakeClient:
+    """Fake BleakClient that notifies whatever frames respond() returns for each request."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.services = self
+        self._callback = None
+
+    def get_characteristic(self, uuid):
+        return None
+
+    async def start_notify(self, char, callback):
+        self._callback = callback
+
+    async def stop_notify(self, char):
+        pass
+
+    async def write_gatt_char(self, char, data, response=None):
+        register = struct.unpack_from('>H', data, 2)[0]
+        loop = asyncio.get_running_loop()
+        for frame in self.respond(register):
+            loop.call_soon(self._callback, None, frame)
+
+    def respond(self, register: int):
+        return [_reply(register)]
+
+
+class _LateFirstReplyClient(_FakeClient):
+    """The reply to the first request only arrives after the next request."""
+
+    def __init__(self):
+        super().__init__()
+        self._held = None
+
+    def respond(self, register: int):
+        if self._held is None:
+            self._held = _reply(register) # Times out; delivered late, just before the next reply
+            return []
+        return [self._held, _reply(register)]
+
+
+class _RejectingClient(_FakeClient):
+    """Answers reads of the given register with a Modbus exception."""
+
+    def __init__(self, rejected: int):
+        super().__init__()
+        self._rejected = rejected
+
+    def respond(self, register: int):
+        return [_exception_reply()] if register == self._rejected else [_reply(register)]
+
+
+async def test_late_reply_does_not_complete_next_request(monkeypatch):
+    """A reply to a timed-out request must not be taken as the answer to the next one."""
+    monkeypatch.setattr(generic_modbus_device, 'READ_TIMEOUT', 0.05)
+    driver = _make_driver(0x10, 0x20)
+    driver._client = _LateFirstReplyClient()
+
+    assert await driver.poll() == {'b': 0x20}
+
+
+async def test_exception_reply_completes_request():
+    """A rejected read fails straight away instead of timing out, and later reads are unaffected."""
+    driver = _make_driver(0x10, 0x20, 0x30)
+    driver._client = _RejectingClient(0x10)
+
+    # Well under READ_TIMEOUT: the exception reply must not be waited out
+    assert await asyncio.wait_for(driver.poll(), timeout=1.0) == {'b': 0x20, 'c': 0x30}
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from app.devices.renogy_controller import RenogyController
 
@@ -33,4 +35,99 @@ def test_placeholder_for_parser():
 #
 #     assert isinstance(result, dict)
 #     assert result['battery_soc'] == 85
-#     assert result['battery_voltage'] == 13.2 
\ No newline at end of file
+#     assert result['battery_voltage'] == 13.2 
+
+def _frame(byte_count: int, payload: bytes) -> bytearray:
+    """Wrap a payload in a Modbus read response header with a dummy CRC."""
+    return bytearray(b'\x01\x03' + bytes([byte_count]) + payload + b'\x00\x00')
+
+
+# Returned by _handle when the driver dropped the frame without completing the request
+_DROPPED = object()
+
+
+async def _handle(driver: RenogyController, frame: bytearray, section: str):
+    """
+    Feed a notification to the driver while the request for the named section is outstanding
+    (set up the way poll() does) and return what it resolved the request with.
+    """
+    words, parser = next((w, p) for _, w, p in driver.sections if p.__name__ == section)
+    future = asyncio.get_running_loop().create_future()
+    driver._pending_response = future
+    driver._pending_byte_count = words * 2
+    driver._pending_parse = parser
+    driver._notification_handler(None, frame)
+    return future.result() if future.done() else _DROPPED
+
+
+async def test_notification_resolves_with_section_parser():
+    """A reply is parsed by the parser of the section that was requested."""
+    driver = RenogyController(address="00:00:00:00:00:00", device_type="renogy_controller", config={})
+
+    assert await _handle(driver, _frame(2, b'\x00\x04'), '_parse_battery_type') == {'battery_type': 'lithium'}
+    assert await _handle(driver, _frame(16, b'RNG-CTRL-RVR40\x00\x00'), '_parse_device_info') == {'model': 'RNG-CTRL-RVR40'}
+
+
+def test_parse_device_info_strips_padding():
+    """The model string loses both its space padding and its NUL terminator."""
+    driver = RenogyController(address="00:00:00:00:00:00", device_type="renogy_controller", config={})
+    assert driver._parse_device_info(_frame(16, b' RNG-CTRL-RVR \x00\x00')) == {'model': 'RNG-CTRL-RVR'}
+    assert driver._parse_device_info(_frame(16, b'RNG-CTRL\x00\x00      ')) == {'model': 'RNG-CTRL'}
+
+
+async def test_notification_ignores_unrequested_frames():
+    """Frames with another byte count or function code don't complete the pending request."""
+    driver = RenogyController(address="00:00:00:00:00:00", device_type="renogy_controller", config={})
+
+    assert await _handle(driver, _frame(16, b'RNG-CTRL-RVR40\x00\x00'), '_parse_battery_type') is _DROPPED
+    assert await _handle(driver, bytearray(b'\x01\x04\x02\x00\x04\x00\x00'), '_parse_battery_type') is _DROPPED
+    # A Modbus exception reply answers the request, without data
+    assert await _handle(driver, bytearray(b'\x01\x83\x02\x00\x00'), '_parse_battery_type') is None
+    # Truncated replies of the requested size resolve the request without data
+    assert await _handle(driver, _frame(68, bytes(10)), '_parse_charging_info') is None
+    assert await _handle(driver, bytearray(b'\x01\x03\x02\x04'), '_parse_battery_type') is None
+    assert await _handle(driver, bytearray(b'\x01\x03\x10RNG'), '_parse_device_info') is None
+
+
+def test_parse_charging_info():
+    """Verify that the charging info block is decoded from a full 68-byte payload."""
+    payload = bytearray(68)
+    payload[0:2] = (85).to_bytes(2, 'big')        # Battery SOC
+    payload[2:4] = (132).to_bytes(2, 'big')       # Battery voltage (0.1 V)
+    payload[4:6] = (250).to_bytes(2, 'big')       # Battery current (0.01 A)
+    payload[6] = 0x99                             # Controller temperature (-25 C)
+    payload[7] = 21                               # Battery temperature
+    payload[18:20] = (450).to_bytes(2, 'big')     # Solar power
+    payload[38:40] = (1234).to_bytes(2, 'big')    # Power generation today (Wh)
+    payload[56:60] = (987654).to_bytes(4, 'big')  # Power generation total (Wh)
+    payload[64] = 0x80                            # Load on
+    payload[65] = 2                               # Charging state: mppt
+
+    driver = RenogyController(address="00:00:00:00:00:00", device_type="renogy_controller", config={})
+    result = driver._parse_charging_info(bytes(_frame(68, bytes(payload))))
+
+    assert result['battery_soc'] == 85
+    # Unscaled fields are still published as floats (85.0, not 85)
+    assert all(isinstance(result[key], float) for key in (
+        'battery_soc', 'load_power', 'solar_power', 'charging_amp_hours_today', 'discharging_amp_hours_today'))
+    assert result['battery_voltage'] == pytest.approx(13.2)
+    assert result['battery_current'] == pytest.approx(2.5)
+    assert result['controller_temperature'] == -25.0
+    assert result['battery_temperature'] == 21.0
+    assert result['solar_power'] == 450
+    assert result['power_generation_today'] == pytest.approx(1.234)
+    assert result['power_generation_total'] == pytest.approx(987.654)
+    assert result['load_status'] == 'on'
+    assert result['charging_status'] == 'mppt'
+
+
+def test_parse_charging_info_unknown_state():
+    """Charging state codes outside the known range are reported as unknown."""
+    payload = bytearray(68)
+    payload[65] = 9
+
+    driver = RenogyController(address="00:00:00:00:00:00", device_type="renogy_controller", config={})
+    result = driver._parse_charging_info(bytes(_frame(68, bytes(payload))))
+
+    assert result['charging_status'] == 'unknown'
+    assert result['load_status'] == 'off'
@@ -0,0 +1,27 @@
+import struct
+
+from app.devices.renogy_inverter import RenogyInverter
+
+
+def _make_driver() -> RenogyInverter:
+    return RenogyInverter(address="00:00:00:00:00:00", device_type="renogy_inverter")
+
+
+def test_parse_inverter_stats():
+    """Verify that the inverter stats block is decoded and scaled."""
+    payload = struct.pack('>10H', 1200, 150, 1201, 275, 6000, 330, 300, 0, 0, 35)
+    result = _make_driver()._parse_inverter_stats(payload)
+
+    assert result['input_voltage'] == 120.0
+    assert result['input_current'] == 1.5
+    assert result['output_voltage'] == 120.1
+    assert result['output_current'] == 2.75
+    assert result['output_frequency'] == 60.0
+    assert result['load_apparent_power'] == 330
+    assert result['load_active_power'] == 300
+    assert result['temperature'] == 35
+
+
+def test_parse_inverter_stats_length_mismatch():
+    """A truncated block must be rejected rather than partially decoded."""
+    assert _make_driver()._parse_inverter_stats(b'\x00\x01\x00') == {}
@@ -125,6 +125,7 @@ docker run -d \
     -e MQTT_BROKER_HOST="$MQTT_CONNECT_HOST" \
     -e MQTT_PORT="1883" \
     -e POLLING_INTERVAL_SECONDS="30" \
+    -e MAX_CONCURRENT_CONNECTIONS="3" \
     -v "$CONFIG_DIR":/app/config \
     -v /var/run/dbus:/var/run/dbus \
     -v /run/dbus:/run/dbus:ro \